@@ -1,10 +1,10 @@
 import re
 import json
 import os
-import fitz  # PyMuPDF
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
-from unidecode import unidecode  # Özel karakter düzeltme için
+from typing import List, Dict, Tuple, Optional, Iterator
+
+# fitz (PyMuPDF) ve unidecode ağır kütüphaneler; yalnızca kullanıldıkları metotlarda yüklenir
 
 class PDFParagraphProcessor:
     def __init__(self):
@@ -18,6 +18,8 @@ class PDFParagraphProcessor:
 
     def advanced_clean(self, text: str) -> str:
         """Tüm metin temizleme işlemlerini uygular"""
+        from unidecode import unidecode  # Özel karakter düzeltme için
+        
         # Satır sonu tirelemelerini düzelt
         text = self.hyphen_pattern.sub(r'\1\2', text)
         
@@ -43,6 +45,8 @@ class PDFParagraphProcessor:
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF bulunamadı: {pdf_path}")
         
+        import fitz  # PyMuPDF
+        
         doc = fitz.open(pdf_path)
         total_pages = len(doc)
         end_page = end_page or total_pages
@@ -116,7 +120,11 @@ class PDFParagraphProcessor:
 
     def generate_output(self, paragraphs: List[Dict]) -> List[Dict]:
         """Nihai çıktıyı oluştururken cümle bütünlüğünü koru"""
-        output = []
+        return list(self.iter_output(paragraphs))
+
+    def iter_output(self, paragraphs: List[Dict]) -> Iterator[Dict]:
+        """generate_output ile aynı paragrafları, hazır oldukça tek tek üretir"""
+        output_count = 0
         buffer = ""
         buffer_page = 1
         buffer_word_count = 0
@@ -153,7 +161,8 @@ class PDFParagraphProcessor:
                         })
             else:
                 # Buffer'ı çıktıya ekle
-                output.append(self._create_paragraph(buffer, buffer_page, len(output)+1))
+                output_count += 1
+                yield self._create_paragraph(buffer, buffer_page, output_count)
                 
                 # Yeni buffer'ı oluştur
                 buffer = para["text"]
@@ -162,9 +171,14 @@ class PDFParagraphProcessor:
         
         # Kalan buffer'ı ekle
         if buffer:
-            output.append(self._create_paragraph(buffer, buffer_page, len(output)+1))
-        
-        return output
+            output_count += 1
+            yield self._create_paragraph(buffer, buffer_page, output_count)
+
+    def iter_paragraphs(self, pdf_path: str, start_page: int = 1, end_page: int = None) -> Iterator[Dict]:
+        """PDF'den çıkarılan nihai paragrafları akış halinde üretir"""
+        text = self.extract_text(pdf_path, start_page, end_page)
+        raw_paragraphs = self.process_text(text)
+        return self.iter_output(raw_paragraphs)
 
     def _get_first_sentence(self, text: str) -> str:
         """Metnin ilk cümlesini döndürür"""
@@ -184,21 +198,52 @@ class PDFParagraphProcessor:
             "source_page": page
         }
 
+def parse_page_range(input_str: str) -> Tuple[int, Optional[int]]:
+    """'12-15', '5' veya boş metni (başlangıç, bitiş) aralığına çevirir"""
+    input_str = input_str.strip()
+    if not input_str:
+        return (1, None)
+    if '-' in input_str:
+        start, end = map(int, input_str.split('-'))
+        return (max(1, start), end)
+    single_page = int(input_str)
+    return (single_page, single_page)
+
 def get_page_range() -> Tuple[int, int]:
     """Kullanıcıdan sayfa aralığını al"""
     while True:
         try:
-            input_str = input("Sayfa aralığı (örn: 12-15 veya tümü için enter): ").strip()
-            if not input_str:
-                return (1, None)
-            if '-' in input_str:
-                start, end = map(int, input_str.split('-'))
-                return (max(1, start), end)
-            single_page = int(input_str)
-            return (single_page, single_page)
+            return parse_page_range(input("Sayfa aralığı (örn: 12-15 veya tümü için enter): "))
         except ValueError:
             print("Geçersiz giriş! Örnek format: '12-15' veya '5'")
 
+def build_result(processor: PDFParagraphProcessor, pdf_path: str, start_page: int,
+                 end_page: Optional[int], final_output: List[Dict]) -> Dict:
+    """Paragrafları metadata ve istatistiklerle birlikte çıktı yapısına koy"""
+    # İstatistikler
+    stats = {
+        "total_paragraphs": len(final_output),
+        "total_characters": sum(p["char_count"] for p in final_output),
+        "total_words": sum(p["word_count"] for p in final_output),
+        "pages_processed": f"{start_page}-{end_page or list(set(p['source_page'] for p in final_output))[-1]}"
+    }
+    
+    # JSON çıktısı
+    return {
+        "metadata": {
+            "source_file": os.path.basename(pdf_path),
+            "processed_at": datetime.now().isoformat(),
+            "processing_settings": {
+                "hyphen_fix": True,
+                "header_cleaning": True,
+                "min_paragraph_chars": processor.min_paragraph,
+                "max_paragraph_chars": processor.max_paragraph
+            }
+        },
+        "statistics": stats,
+        "paragraphs": final_output
+    }
+
 def main():
     print("=== PDF ULTIMATE PROCESSOR ===")
     print("Tireleme düzeltme ve gelişmiş temizleme aktif\n")
@@ -220,29 +265,8 @@ def main():
         raw_paragraphs = processor.process_text(text)
         final_output = processor.generate_output(raw_paragraphs)
         
-        # İstatistikler
-        stats = {
-            "total_paragraphs": len(final_output),
-            "total_characters": sum(p["char_count"] for p in final_output),
-            "total_words": sum(p["word_count"] for p in final_output),
-            "pages_processed": f"{start_page}-{end_page or list(set(p['source_page'] for p in final_output))[-1]}"
-        }
-        
-        # JSON çıktısı
-        result = {
-            "metadata": {
-                "source_file": os.path.basename(pdf_path),
-                "processed_at": datetime.now().isoformat(),
-                "processing_settings": {
-                    "hyphen_fix": True,
-                    "header_cleaning": True,
-                    "min_paragraph_chars": processor.min_paragraph,
-                    "max_paragraph_chars": processor.max_paragraph
-                }
-            },
-            "statistics": stats,
-            "paragraphs": final_output
-        }
+        result = build_result(processor, pdf_path, start_page, end_page, final_output)
+        stats = result["statistics"]
         
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(result, f, indent=2, ensure_ascii=False)
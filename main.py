@@ -1,17 +1,22 @@
-import requests
 import json
 import os
+import re
 from datetime import datetime
 import time
 import random
 
-start_time = datetime.now()
-print(f"İşlem başlangıç zamanı: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+# requests yalnızca API isteği sırasında yüklenir (CLI hızlı açılsın diye)
 
-# Yeni dosya adı ve tarihi içeren benzersiz bir isim oluştur
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-output_file_path = f'trainset_qa_{timestamp}.json'
-print(f"Oluşturulan soru-cevap çiftleri '{output_file_path}' dosyasına kaydedilecek.")
+# Önbellek dostu zamanlama modu (llama.cpp uyumlu sunucular için)
+# PRELID_CACHE_MODE=1 ile açılır; istekler cache_prompt ile tek bir sabit slota gönderilir.
+# Döngü tek işçiyle sırayla çalıştığı için ortak önek (sistem mesajı) o slotun KV önbelleğinde kalır.
+CACHE_MODE = os.environ.get("PRELID_CACHE_MODE", "0") == "1"
+SLOT_ID = int(os.environ.get("PRELID_SLOT_ID", "0"))  # İsteklerin bağlanacağı sunucu slotu
+ttft_log_file = 'ttft_log.jsonl'
+
+# Varsayılan dosya adları
+train_file_path = 'PreLidPreLim.json'
+progress_file = 'progress.txt'
 
 # Güvenli dosya yazma fonksiyonu
 def safe_write_to_file(data, file_path):
@@ -43,36 +48,81 @@ def safe_write_to_file(data, file_path):
         print(f"Dosya yazma hatası: {str(e)}")
         return False
 
-# Tüm soru-cevap çiftlerini saklamak için ana liste
-all_qa_pairs = []
+# İlerleme dosyasını oku
+def _load_progress(progress_path):
+    """
+    (kaynak, son paragraf) döndürür. Eski biçimde (yalnızca sayı) kaynak None olur.
+    """
+    if os.path.exists(progress_path):
+        with open(progress_path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+        if content and content.isdigit():
+            return None, int(content)
+        try:
+            state = json.loads(content)
+            return state.get("source"), int(state.get("last_processed", 0))
+        except (ValueError, AttributeError):
+            pass
+    return None, 0
 
-# Giriş dosyası kontrolü (PreLidPreLim.json)
-train_file_path = 'PreLidPreLim.json'
-if not os.path.exists(train_file_path) or os.path.getsize(train_file_path) == 0:
-    with open(train_file_path, 'w', encoding='utf-8') as file:
-        json.dump({"paragraphs": []}, file, ensure_ascii=False, indent=2)
-    print(f"{train_file_path} dosyası oluşturuldu.")
+# İlerleme durumunu oku
+def read_progress(progress_path=progress_file, source=None):
+    """
+    Son işlenen paragraf numarasını döndürür, dosya yoksa 0.
+    source verilirse ilerleme yalnızca aynı kaynağa aitse geçerlidir;
+    başka bir kaynağın ilerlemesi için 0 döner. Eski biçimdeki (yalnızca sayı)
+    dosya, eski main.py'nin kullandığı PreLidPreLim.json kaynağına sayılır.
+    """
+    recorded_source, last_processed = _load_progress(progress_path)
+    if recorded_source is None:
+        recorded_source = os.path.abspath(train_file_path)
+    if source is not None and recorded_source != source:
+        return 0
+    return last_processed
 
-# İlerleme durumu kontrolü ve oluşturma
-progress_file = 'progress.txt'
-last_processed = 0
+# İlerleme dosyasının ait olduğu kaynak
+def progress_source(progress_path=progress_file):
+    return _load_progress(progress_path)[0]
 
-if os.path.exists(progress_file):
-    with open(progress_file, 'r', encoding='utf-8') as f:
-        content = f.read().strip()
-        if content and content.isdigit():
-            last_processed = int(content)
-            print(f"Kaldığınız yerden devam ediliyor: Paragraf {last_processed + 1}")
+# İlerleme durumunu yaz
+def write_progress(last_processed, progress_path=progress_file, source=None):
+    with open(progress_path, 'w', encoding='utf-8') as f:
+        if source is None:
+            f.write(str(last_processed))
+        else:
+            json.dump({"source": source, "last_processed": last_processed}, f, ensure_ascii=False)
 
 # Giriş dosyasını oku
-with open(train_file_path, 'r', encoding='utf-8') as file:
-    try:
-        data = json.load(file)
-    except json.JSONDecodeError:
-        print(f"{train_file_path} dosyasında JSON hatası. Temel yapı oluşturuluyor.")
-        data = {"paragraphs": []}
-        with open(train_file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+def load_paragraph_data(file_path=train_file_path):
+    """
+    Paragraf JSON dosyasını okur. Dosya yoksa, boşsa veya bozuksa
+    temel yapıyı oluşturur.
+    """
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump({"paragraphs": []}, file, ensure_ascii=False, indent=2)
+        print(f"{file_path} dosyası oluşturuldu.")
+    
+    with open(file_path, 'r', encoding='utf-8') as file:
+        try:
+            return json.load(file)
+        except json.JSONDecodeError:
+            print(f"{file_path} dosyasında JSON hatası. Temel yapı oluşturuluyor.")
+            data = {"paragraphs": []}
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            return data
+
+# Satır satır paragraf oku (.jsonl)
+def iter_paragraph_lines(file_path):
+    """
+    Her satırı bir paragraf olan dosyayı tamamını belleğe almadan okur.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
 
 # Bekle ve tekrar dene fonksiyonu
 def wait_with_backoff(retry, base_wait=5, max_wait=300):
@@ -83,46 +133,110 @@ def wait_with_backoff(retry, base_wait=5, max_wait=300):
     print(f"{wait_time:.1f} saniye bekleniyor...")
     time.sleep(wait_time)
 
+# Tüm isteklerde aynı kalan sistem mesajı.
+# Sunucu tarafı önbelleğin işe yaraması için bu önek bayt bayt aynı olmalı, bu yüzden sabit tutulur.
+SYSTEM_PROMPT = "Generate 3-5 question-answer pairs from the given text. Format your response as a valid JSON array of objects, each with 'question', 'answer', and 'type' fields (types: factual, analytical, interpretative, contextual). Ensure your response is properly formatted JSON."
+
+# Paragraf numarasını ID'den çıkar
+def paragraph_number(paragraph, default=0):
+    paragraph_id = paragraph["paragraph_id"]
+    if paragraph_id.startswith("para_") and paragraph_id.split("_")[1].isdigit():
+        return int(paragraph_id.split("_")[1])
+    return default
+
+# Paragrafları gönderim sırasına koy
+def iter_scheduled(paragraphs):
+    """
+    Liste verilirse paragrafları ID'lerine göre sıralar, akış (generator)
+    verilirse splitter zaten ID sırasında ürettiği için aynen iletir.
+    Sıra her zaman artan ID'de kalır; ilerleme dosyası buna dayanır.
+    """
+    if isinstance(paragraphs, list):
+        return sorted(paragraphs, key=paragraph_number)
+    return paragraphs
+
 # API istek fonksiyonu
-def make_api_request(paragraph_content, paragraph_id, max_retries=5):
+def make_api_request(paragraph_content, paragraph_id, max_retries=5, cache_mode=CACHE_MODE, slot_id=SLOT_ID):
     """
     LM Studio API'sine istek gönderir ve sonucu döndürür.
     Başarısız olursa tekrar dener.
+    Yanıt akış (stream) olarak alınır; ilk token süresi (TTFT) sonucun
+    'ttft' alanına, sunucunun döndürdüğü süre bilgileri 'timings' alanına yazılır.
     """
+    import requests
+    
     truncated_content = paragraph_content
     # Çok uzun paragrafları kısalt
     if len(paragraph_content) > 1500:
         truncated_content = paragraph_content[:1500] + "..."
         print(f"Uyarı: Paragraf çok uzun ({len(paragraph_content)} karakter). Kısaltıldı.")
     
+    payload = {
+        "model": "qwen1.5-7b-chat",
+        "messages": [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": truncated_content
+            }
+        ],
+        "temperature": 0.7,
+        "max_tokens": 800,
+        "stream": True
+    }
+    # llama.cpp sunucusu önbelleği varsayılan olarak açık tutar; kapalı modun gerçek
+    # bir karşılaştırma olması için cache_prompt her zaman açıkça gönderilir
+    payload["cache_prompt"] = cache_mode
+    if cache_mode:
+        # İsteği sabit slota bağla
+        payload["id_slot"] = slot_id
+    
     for retry in range(max_retries):
         try:
             print(f"Paragraf {paragraph_id} için API isteği gönderiliyor (Deneme {retry+1}/{max_retries})...")
             
-            # Sistem mesajı ile daha açık talimatlar
+            request_start = time.perf_counter()
             response = requests.post(
                 "http://127.0.0.1:1234/v1/chat/completions",
                 headers={"Content-Type": "application/json"},
-                json={
-                    "model": "qwen1.5-7b-chat",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "Generate 3-5 question-answer pairs from the given text. Format your response as a valid JSON array of objects, each with 'question', 'answer', and 'type' fields (types: factual, analytical, interpretative, contextual). Ensure your response is properly formatted JSON."
-                        },
-                        {
-                            "role": "user",
-                            "content": truncated_content
-                        }
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 800
-                },
-                timeout=300  # 5 dakika
+                json=payload,
+                timeout=300,  # 5 dakika
+                stream=True
             )
             
             if response.status_code == 200:
-                return response.json()
+                content_parts = []
+                ttft = None
+                timings = None
+                # text/event-stream yanıtında charset yok; requests ISO-8859-1 varsaymasın
+                response.encoding = 'utf-8'
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    chunk_data = line[len("data:"):].strip()
+                    if chunk_data == "[DONE]":
+                        break
+                    chunk = json.loads(chunk_data)
+                    if chunk.get("timings"):
+                        timings = chunk["timings"]
+                    if not chunk.get("choices"):
+                        continue
+                    delta = chunk["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        if ttft is None:
+                            ttft = time.perf_counter() - request_start
+                        content_parts.append(delta)
+                
+                if ttft is not None:
+                    print(f"İlk token süresi (TTFT): {ttft:.3f} saniye")
+                return {
+                    "choices": [{"message": {"role": "assistant", "content": "".join(content_parts)}}],
+                    "ttft": ttft,
+                    "timings": timings
+                }
             else:
                 print(f"HTTP isteği başarısız: {response.status_code}")
                 print(f"Yanıt içeriği: {response.text}")
@@ -143,152 +257,245 @@ def make_api_request(paragraph_content, paragraph_id, max_retries=5):
     
     return None
 
-# Paragraflar varsa devam et
-if "paragraphs" in data and len(data["paragraphs"]) > 0:
-    paragraphs_count = len(data['paragraphs'])
-    print(f"Toplam {paragraphs_count} paragraf işlenecek.")
+# TTFT ölçümlerini özetle ve kayıt dosyasına ekle
+def record_ttft_stats(samples, prompt_tokens, cached_tokens, cache_mode=CACHE_MODE, slot_id=SLOT_ID):
+    """
+    Önbellek modu açık ve kapalı çalıştırmaların karşılaştırılabilmesi için
+    TTFT özetini ekrana basar ve ttft_log.jsonl dosyasına bir satır ekler.
+    """
+    if not samples:
+        print("TTFT ölçümü yok.")
+        return None
     
-    # Paragrafları ID'lerine göre sırala
-    sorted_paragraphs = sorted(data["paragraphs"], 
-                              key=lambda p: int(p["paragraph_id"].split("_")[1]) 
-                              if p["paragraph_id"].startswith("para_") and p["paragraph_id"].split("_")[1].isdigit() 
-                              else 0)
+    ordered = sorted(samples)
+    middle = len(ordered) // 2
+    median = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+    stats = {
+        "run_at": datetime.now().isoformat(),
+        "cache_mode": cache_mode,
+        "cache_prompt": cache_mode,
+        "slot_id": slot_id if cache_mode else None,
+        "requests": len(samples),
+        "ttft_mean": round(sum(samples) / len(samples), 4),
+        "ttft_median": round(median, 4),
+        "ttft_total": round(sum(samples), 4),
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": cached_tokens
+    }
     
-  # Her seferinde bir paragraf işle
-for i, paragraph in enumerate(sorted_paragraphs, 1):
-    paragraph_id = paragraph["paragraph_id"]
-    para_num = int(paragraph_id.split("_")[1]) if paragraph_id.startswith("para_") and paragraph_id.split("_")[1].isdigit() else i
+    print(f"TTFT (önbellek {'açık' if cache_mode else 'kapalı'}): "
+          f"ortalama {stats['ttft_mean']} sn, medyan {stats['ttft_median']} sn, {stats['requests']} istek")
+    if prompt_tokens or cached_tokens:
+        print(f"İşlenen prompt token: {prompt_tokens}, önbellekten gelen token: {cached_tokens}")
     
-    # Eğer bu paragraf daha önce işlendiyse atla
-    if para_num <= last_processed:
-        print(f"Paragraf {para_num} daha önce işlenmiş, atlanıyor...")
-        continue
+    try:
+        with open(ttft_log_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(stats, ensure_ascii=False) + "\n")
+    except Exception as e:
+        print(f"TTFT kayıt hatası: {str(e)}")
+    return stats
+
+# Model yanıtını soru-cevap listesine dönüştür
+def parse_qa_content(content):
+    """
+    Model yanıtındaki JSON dizisini ayıklar. Bozuk JSON için önce objeleri
+    tek tek, sonra alanları regex ile çıkarmayı dener. Başarısız olursa hata fırlatır.
+    """
+    # JSON içerik kontrolü ve temizleme
+    content = content.strip()
+    
+    # JSON olmayan prefix/suffix'leri temizle
+    if '[' in content and ']' in content:
+        start_idx = content.find('[')
+        end_idx = content.rfind(']') + 1
+        content = content[start_idx:end_idx]
     
-    print(f"\n===== Paragraf {para_num}/{paragraphs_count} işleniyor =====")
+    # JSON formatı için düzeltmeler
+    content = content.replace("'", '"')
+    content = content.replace('\n', ' ').replace('\r', '')
     
+    # Dikkatli JSON parse etme
     try:
-        paragraph_content = paragraph["content"]
-        
-        # Modele gönderilecek içeriği sınırlandır
-        if len(paragraph_content) < 10:  # Çok kısa içerikleri atla
-            print(f"Paragraf {para_num} çok kısa, atlanıyor...")
-            last_processed = para_num
-            with open(progress_file, 'w', encoding='utf-8') as f:
-                f.write(str(last_processed))
-            continue
-        
-        # Her paragraf işlemesi arasında biraz bekle (sistem dinlensin)
-        if i > 1:
-            cooldown_time = random.randint(10, 20)  # 10-20 saniye arası rastgele bekleme
-            print(f"Sistem dinlenmesi için {cooldown_time} saniye bekleniyor...")
-            time.sleep(cooldown_time)
+        parsed = json.loads(content)
+    except json.JSONDecodeError as e:
+        print(f"JSON ayrıştırma hatası: {e}")
+        print("Manuel JSON temizleme deneniyor...")
+    
+        # JSON-benzeri içerikten sadece geçerli objeleri çıkar
+        objects = re.findall(r'\{.*?\}', content)
+        if objects:
+            try:
+                parsed = [json.loads(obj) for obj in objects]
+            except:
+                print("Objeleri ayrı ayrı ayrıştırma başarısız.")
+                # Son çare: manuel soru-cevap çıkarma
+                questions = re.findall(r'"question"\s*:\s*"([^"]+)"', content)
+                answers = re.findall(r'"answer"\s*:\s*"([^"]+)"', content)
+                types = re.findall(r'"type"\s*:\s*"([^"]+)"', content)
+    
+                if questions and answers:
+                    parsed = []
+                    for i in range(min(len(questions), len(answers))):
+                        q_type = types[i] if i < len(types) else "factual"
+                        parsed.append({
+                            "question": questions[i],
+                            "answer": answers[i],
+                            "type": q_type
+                        })
+                else:
+                    print("Manuel ayrıştırma başarısız.")
+                    raise
+        else:
+            raise
+    
+    return parsed if isinstance(parsed, list) else [parsed]
+
+# Paragraflardan soru-cevap üret
+def generate_qa(paragraphs, progress_path=progress_file, cache_mode=CACHE_MODE, slot_id=SLOT_ID,
+                cooldown=(10, 20), total=None, source=None, restart=False):
+    """
+    Paragrafları sırayla modele gönderir ve her başarılı paragraf için
+    (paragraf numarası, soru-cevap listesi) üretir.
+    paragraphs liste ya da akış (generator) olabilir; akışta paragraflar
+    geldikçe işlenir. İlerleme dosyasındaki paragraflar atlanır ve ilerleme,
+    üretilen çiftler tüketildikten sonra güncellenir. İlerleme source ile
+    birlikte kaydedilir; başka bir kaynağın ilerlemesi ya da restart=True
+    verilmesi durumunda baştan başlanır.
+    """
+    # Eksik bağımlılık her paragrafta ayrı hata olarak yutulmasın, komut hemen dursun
+    import requests
+    
+    if restart:
+        write_progress(0, progress_path, source)
+    last_processed = 0 if restart else read_progress(progress_path, source)
+    if last_processed:
+        print(f"Kaldığınız yerden devam ediliyor: Paragraf {last_processed + 1}")
+    elif not restart and _load_progress(progress_path)[1] > 0:
+        print(f"İlerleme dosyası başka bir kaynağa ait ({progress_source(progress_path) or train_file_path}), baştan başlanıyor.")
+    
+    if total is None and isinstance(paragraphs, list):
+        total = len(paragraphs)
+    total_label = total if total is not None else "?"
+    
+    # TTFT ölçümleri ve sunucunun bildirdiği prompt/önbellek token sayıları
+    ttft_samples = []
+    prompt_tokens_total = 0
+    cached_tokens_total = 0
+    
+    sent_requests = 0
+    try:
+        # Her seferinde bir paragraf işle
+        for i, paragraph in enumerate(iter_scheduled(paragraphs), 1):
+            para_num = paragraph_number(paragraph, i)
         
-        # Model isteği
-        response_data = make_api_request(paragraph_content, para_num)
+            # Eğer bu paragraf daha önce işlendiyse atla
+            if para_num <= last_processed:
+                print(f"Paragraf {para_num} daha önce işlenmiş, atlanıyor...")
+                continue
         
-        if response_data:
-            content = response_data['choices'][0]['message']['content']
-            print(f"Model yanıtı alındı.")
+            print(f"\n===== Paragraf {para_num}/{total_label} işleniyor =====")
             
             try:
-                # JSON içerik kontrolü ve temizleme
-                content = content.strip()
+                paragraph_content = paragraph["content"]
                 
-                # JSON olmayan prefix/suffix'leri temizle
-                if '[' in content and ']' in content:
-                    start_idx = content.find('[')
-                    end_idx = content.rfind(']') + 1
-                    content = content[start_idx:end_idx]
+                # Modele gönderilecek içeriği sınırlandır
+                if len(paragraph_content) < 10:  # Çok kısa içerikleri atla
+                    print(f"Paragraf {para_num} çok kısa, atlanıyor...")
+                    last_processed = para_num
+                    write_progress(last_processed, progress_path, source)
+                    continue
                 
-                # JSON formatı için düzeltmeler
-                content = content.replace("'", '"')
-                content = content.replace('\n', ' ').replace('\r', '')
+                # Her paragraf işlemesi arasında biraz bekle (sistem dinlensin)
+                if sent_requests > 0 and cooldown:
+                    cooldown_time = random.randint(*cooldown)  # Varsayılan 10-20 saniye arası rastgele bekleme
+                    print(f"Sistem dinlenmesi için {cooldown_time} saniye bekleniyor...")
+                    time.sleep(cooldown_time)
                 
-                # Dikkatli JSON parse etme
-                try:
-                    parsed = json.loads(content)
-                except json.JSONDecodeError as e:
-                    print(f"JSON ayrıştırma hatası: {e}")
-                    print("Manuel JSON temizleme deneniyor...")
+                # Model isteği
+                sent_requests += 1
+                response_data = make_api_request(paragraph_content, para_num, cache_mode=cache_mode, slot_id=slot_id)
                     
-                    # Daha güçlü JSON temizleme dene
-                    import re
-                    # JSON-benzeri içerikten sadece geçerli objeleri çıkar
-                    objects = re.findall(r'\{.*?\}', content)
-                    if objects:
-                        try:
-                            parsed = [json.loads(obj) for obj in objects]
-                        except:
-                            print("Objeleri ayrı ayrı ayrıştırma başarısız.")
-                            # Son çare: manuel soru-cevap çıkarma
-                            questions = re.findall(r'"question"\s*:\s*"([^"]+)"', content)
-                            answers = re.findall(r'"answer"\s*:\s*"([^"]+)"', content)
-                            types = re.findall(r'"type"\s*:\s*"([^"]+)"', content)
+                if response_data:
+                    if response_data.get("ttft") is not None:
+                        ttft_samples.append(response_data["ttft"])
+                    timings = response_data.get("timings") or {}
+                    prompt_tokens_total += timings.get("prompt_n", 0)
+                    cached_tokens_total += timings.get("cache_n", 0)
                             
-                            if questions and answers:
-                                parsed = []
-                                for i in range(min(len(questions), len(answers))):
-                                    q_type = types[i] if i < len(types) else "factual"
-                                    parsed.append({
-                                        "question": questions[i],
-                                        "answer": answers[i],
-                                        "type": q_type
-                                    })
-                            else:
-                                print("Manuel ayrıştırma başarısız.")
-                                raise
-                    else:
-                        raise
+                    content = response_data['choices'][0]['message']['content']
+                    print(f"Model yanıtı alındı.")
                 
-                # Ayrıştırılan veriyi ana listeye ekle
-                if isinstance(parsed, list):
-                    all_qa_pairs.extend(parsed)
+                    try:
+                        parsed = parse_qa_content(content)
+                    except Exception as e:
+                        print(f"JSON işleme hatası: {str(e)}")
+                        print(f"Ham içerik:\n{content}")
+                        
+                        # Hata olsa bile ilerleme dosyasını güncelle
+                        last_processed = para_num
+                        write_progress(last_processed, progress_path, source)
+                        continue
+                    
+                    print(f"Paragraf {para_num}/{total_label} için {len(parsed)} soru-cevap çifti oluşturuldu.")
+                    yield para_num, parsed
+                    
+                    # İlerleme durumunu güncelle (çiftler kaydedildikten sonra)
+                    last_processed = para_num
+                    write_progress(last_processed, progress_path, source)
                 else:
-                    all_qa_pairs.append(parsed)
-                
-                # Dosyaya düzenli olarak kaydet
-                if safe_write_to_file(all_qa_pairs, output_file_path):
-                    print(f"Şu ana kadar toplam {len(all_qa_pairs)} soru-cevap çifti kaydedildi.")
-                
-                print(f"Paragraf {para_num}/{paragraphs_count} için {len(parsed) if isinstance(parsed, list) else 1} soru-cevap çifti oluşturuldu.")
-                
-                # İlerleme durumunu güncelle
-                last_processed = para_num
-                with open(progress_file, 'w', encoding='utf-8') as f:
-                    f.write(str(last_processed))
-                
-                # TEST İÇİN EKLE: Sadece bir paragrafı işledikten sonra döngüden çık
-               #  break  Bu satırı test sonrası kaldırın
+                    print(f"Paragraf {para_num}/{total_label} için model yanıtı alınamadı.")
                 
             except Exception as e:
-                print(f"JSON işleme hatası: {str(e)}")
-                print(f"Ham içerik:\n{content}")
+                print(f"Paragraf {para_num} işlenirken beklenmeyen hata: {str(e)}")
+    finally:
+        # Önbellek modunun kazancını ölçmek için TTFT özetini kaydet
+        record_ttft_stats(ttft_samples, prompt_tokens_total, cached_tokens_total, cache_mode, slot_id)
                 
-                # Hata olsa bile ilerleme dosyasını güncelle
-                last_processed = para_num
-                with open(progress_file, 'w', encoding='utf-8') as f:
-                    f.write(str(last_processed))
-        else:
-            print(f"Paragraf {para_num}/{paragraphs_count} için model yanıtı alınamadı.")
+def main():
+    start_time = datetime.now()
+    print(f"İşlem başlangıç zamanı: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    
+    # Yeni dosya adı ve tarihi içeren benzersiz bir isim oluştur
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file_path = f'trainset_qa_{timestamp}.json'
+    print(f"Oluşturulan soru-cevap çiftleri '{output_file_path}' dosyasına kaydedilecek.")
+    print(f"Önbellek modu: {'açık' if CACHE_MODE else 'kapalı'} (slot: {SLOT_ID})")
+    
+    # Tüm soru-cevap çiftlerini saklamak için ana liste
+    all_qa_pairs = []
+    
+    data = load_paragraph_data(train_file_path)
+    
+    # Paragraflar varsa devam et
+    if "paragraphs" in data and len(data["paragraphs"]) > 0:
+        print(f"Toplam {len(data['paragraphs'])} paragraf işlenecek.")
+        
+        for para_num, parsed in generate_qa(data["paragraphs"], progress_file, source=os.path.abspath(train_file_path)):
+            # Ayrıştırılan veriyi ana listeye ekle
+            all_qa_pairs.extend(parsed)
             
-    except Exception as e:
-        print(f"Paragraf {para_num} işlenirken beklenmeyen hata: {str(e)}")
-else:
-    print(f"{train_file_path} dosyasında hiç paragraf bulunamadı.")
-
-# Son bir kez daha dosyaya yaz
-if all_qa_pairs:
-    if safe_write_to_file(all_qa_pairs, output_file_path):
-        print(f"İşlem tamamlandı. Toplam {len(all_qa_pairs)} soru-cevap çifti kaydedildi.")
+            # Dosyaya düzenli olarak kaydet
+            if safe_write_to_file(all_qa_pairs, output_file_path):
+                print(f"Şu ana kadar toplam {len(all_qa_pairs)} soru-cevap çifti kaydedildi.")
     else:
-        print("UYARI: Son dosya yazma işlemi başarısız oldu!")
+        print(f"{train_file_path} dosyasında hiç paragraf bulunamadı.")
+    
+    # Son bir kez daha dosyaya yaz
+    if all_qa_pairs:
+        if safe_write_to_file(all_qa_pairs, output_file_path):
+            print(f"İşlem tamamlandı. Toplam {len(all_qa_pairs)} soru-cevap çifti kaydedildi.")
+        else:
+            print("UYARI: Son dosya yazma işlemi başarısız oldu!")
+            
+    # Bitiş zamanını hesapla
+    end_time = datetime.now()
+    duration = end_time - start_time
+    duration_min = round(duration.total_seconds() / 60, 2)
 
-# Bitiş zamanını hesapla
-end_time = datetime.now()
-duration = end_time - start_time
-duration_min = round(duration.total_seconds() / 60, 2)
+    print(f"\nİşlem bitiş zamanı: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Toplam süre: {duration_min} dakika")
+    print(f"Toplam işlenen paragraf sayısı: {read_progress(progress_file, os.path.abspath(train_file_path))}/{len(data['paragraphs']) if 'paragraphs' in data else 0}")
+    print(f"Soru-cevap çiftleri '{output_file_path}' dosyasına kaydedildi.")
 
-print(f"\nİşlem bitiş zamanı: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-print(f"Toplam süre: {duration_min} dakika")
-print(f"Toplam işlenen paragraf sayısı: {last_processed}/{len(data['paragraphs']) if 'paragraphs' in data else 0}")
-print(f"Soru-cevap çiftleri '{output_file_path}' dosyasına kaydedildi.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""
+PreLidPreLim komut satırı aracı.
+
+    python prelid.py split kitap.pdf --pages 12-15 -o PreLidPreLim.json
+    python prelid.py generate -i PreLidPreLim.json -o trainset_qa.jsonl
+    python prelid.py export -i trainset_qa.jsonl -o trainset_qa.csv
+    python prelid.py run kitap.pdf
+
+'run' paragrafları splitter'dan doğrudan üreticiye, üreticiden de
+dışa aktarıcıya akıtır; ara dosyalar satır satır (.jsonl) yazılır, böylece
+her aşama kendi dosyasından tekrar başlatılabilir (--from).
+fitz, unidecode ve requests yalnızca ihtiyaç duyulan komutta yüklenir.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+
+QA_FIELDS = ["question", "answer", "type"]
+
+# 'run' tarafından yazılan PDF kaynak anahtarı: /yol/kitap.pdf#1-son
+PDF_SOURCE_PATTERN = re.compile(r'\.pdf#\d+-(\d+|son)$', re.IGNORECASE)
+
+
+def _require_file(path):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Dosya bulunamadı: {path}")
+
+
+def _require_generate_dependencies():
+    """Çıktı dosyaları açılmadan önce eksik bağımlılıkta komutu durdur"""
+    import requests  # noqa: F401
+
+
+def _source_sidecar(paragraphs_path):
+    """Paragraf ara dosyasının hangi kaynaktan üretildiğini tutan yan dosya"""
+    return paragraphs_path + ".source"
+
+
+def _paragraphs_source(args):
+    """
+    'run --from generate' için paragraf dosyasının kaynağı: önce yan dosya,
+    yoksa ilerleme dosyasındaki 'run' tarafından yazılmış PDF kaynağı,
+    o da yoksa paragraf dosyasının kendisi.
+    """
+    from main import progress_source
+
+    sidecar = _source_sidecar(args.paragraphs)
+    if os.path.exists(sidecar):
+        with open(sidecar, "r", encoding="utf-8") as f:
+            source = f.read().strip()
+        if source:
+            return source
+    recorded = progress_source(args.progress)
+    if recorded and PDF_SOURCE_PATTERN.search(recorded):
+        return recorded
+    return os.path.abspath(args.paragraphs)
+
+
+def _iter_source_paragraphs(input_path):
+    """Paragraf dosyasını okur: .jsonl satır satır, .json ise eski tam dosya formatı"""
+    from main import iter_paragraph_lines, load_paragraph_data
+
+    _require_file(input_path)
+    if input_path.endswith(".jsonl"):
+        return iter_paragraph_lines(input_path), None
+    data = load_paragraph_data(input_path)
+    return data.get("paragraphs", []), len(data.get("paragraphs", []))
+
+
+def _iter_qa_pairs(input_path):
+    """Soru-cevap dosyasını okur: .jsonl satır satır, .json ise tek JSON dizisi"""
+    with open(input_path, "r", encoding="utf-8") as f:
+        if input_path.endswith(".jsonl"):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def _tee_to_jsonl(items, output_path):
+    """Akıştaki her öğeyi bir satır olarak dosyaya yazar ve aynen iletir"""
+    with open(output_path, "w", encoding="utf-8") as f:
+        for item in items:
+            f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            f.flush()
+            yield item
+
+
+def _open_csv(output_path, append):
+    """CSV dosyasını açar; yeni ya da boş dosyaya başlık satırı yazar"""
+    write_header = not append or not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+    f = open(output_path, "a" if append else "w", encoding="utf-8", newline="")
+    writer = csv.DictWriter(f, fieldnames=QA_FIELDS, restval="", extrasaction="ignore")
+    if write_header:
+        writer.writeheader()
+    return f, writer
+
+
+def _split_stream(args):
+    from Pdf.pdf_spliter import PDFParagraphProcessor, parse_page_range
+
+    start_page, end_page = parse_page_range(args.pages or "")
+    processor = PDFParagraphProcessor()
+    print(f"🔍 PDF işleniyor (Sayfalar: {start_page}-{end_page or 'son'})...")
+    return processor, start_page, end_page, processor.iter_paragraphs(args.pdf, start_page, end_page)
+
+
+def _pdf_source(pdf_path, start_page, end_page):
+    """İlerleme dosyasında PDF ve sayfa aralığını tanımlayan anahtar"""
+    return f"{os.path.abspath(pdf_path)}#{start_page}-{end_page or 'son'}"
+
+
+def _resume(args, source):
+    """Önceki çıktılara eklenip eklenmeyeceğini belirler (--restart / --resume)"""
+    from main import read_progress
+
+    if args.restart:
+        return False
+    resume = read_progress(args.progress, source) > 0
+    if args.resume and not resume:
+        raise RuntimeError(f"'{source}' için devam edilecek ilerleme yok: {args.progress}")
+    return resume
+
+
+def _generate_options(args, source):
+    from main import CACHE_MODE, SLOT_ID
+
+    return {
+        "progress_path": args.progress,
+        "source": source,
+        "restart": args.restart,
+        "cache_mode": args.cache or CACHE_MODE,
+        "slot_id": SLOT_ID if args.slot is None else args.slot,
+        "cooldown": None if args.no_cooldown else (10, 20),
+    }
+
+
+def cmd_split(args):
+    from Pdf.pdf_spliter import build_result
+    from main import safe_write_to_file
+
+    processor, start_page, end_page, paragraphs = _split_stream(args)
+    if args.output.endswith(".jsonl"):
+        count = sum(1 for _ in _tee_to_jsonl(paragraphs, args.output))
+    else:
+        final_output = list(paragraphs)
+        count = len(final_output)
+        if not safe_write_to_file(build_result(processor, args.pdf, start_page, end_page, final_output), args.output):
+            return 1
+    print(f"✅ {count} paragraf '{args.output}' dosyasına yazıldı.")
+    return 0
+
+
+def cmd_generate(args):
+    from main import generate_qa
+
+    paragraphs, total = _iter_source_paragraphs(args.input)
+    source = os.path.abspath(args.input)
+    _require_generate_dependencies()
+    append = _resume(args, source)
+    count = 0
+    with open(args.output, "a" if append else "w", encoding="utf-8") as f:
+        for para_num, pairs in generate_qa(paragraphs, total=total, **_generate_options(args, source)):
+            for pair in pairs:
+                f.write(json.dumps(pair, ensure_ascii=False) + "\n")
+            f.flush()
+            count += len(pairs)
+    print(f"✅ {count} yeni soru-cevap çifti '{args.output}' dosyasına eklendi.")
+    return 0
+
+
+def cmd_export(args):
+    _require_file(args.input)
+    f, writer = _open_csv(args.output, append=False)
+    count = 0
+    with f:
+        for pair in _iter_qa_pairs(args.input):
+            writer.writerow(pair)
+            count += 1
+    print(f"✅ {count} soru-cevap çifti '{args.output}' dosyasına aktarıldı.")
+    return 0
+
+
+def cmd_run(args):
+    from main import generate_qa, iter_paragraph_lines
+
+    if args.start == "export":
+        args.input = args.qa
+        return cmd_export(args)
+
+    _require_generate_dependencies()
+
+    if args.start == "split":
+        if not args.pdf:
+            print("❌ Hata: 'split' aşamasından başlamak için PDF dosyası gerekli.")
+            return 2
+        _require_file(args.pdf)
+        _, start_page, end_page, paragraphs = _split_stream(args)
+        source = _pdf_source(args.pdf, start_page, end_page)
+        with open(_source_sidecar(args.paragraphs), "w", encoding="utf-8") as f:
+            f.write(source)
+        paragraphs = _tee_to_jsonl(paragraphs, args.paragraphs)
+    else:
+        # Paragraf dosyası önceki 'run' tarafından yazıldıysa onun kaynağıyla devam et
+        _require_file(args.paragraphs)
+        paragraphs = iter_paragraph_lines(args.paragraphs)
+        source = _paragraphs_source(args)
+
+    # Aynı kaynağın ilerlemesi varsa önceki çıktılara eklenir, yoksa baştan yazılır
+    append = _resume(args, source)
+    count = 0
+    csv_file, writer = _open_csv(args.output, append)
+    with csv_file, open(args.qa, "a" if append else "w", encoding="utf-8") as qa_file:
+        for para_num, pairs in generate_qa(paragraphs, **_generate_options(args, source)):
+            for pair in pairs:
+                qa_file.write(json.dumps(pair, ensure_ascii=False) + "\n")
+                writer.writerow(pair)
+            qa_file.flush()
+            csv_file.flush()
+            count += len(pairs)
+    print(f"✅ {count} yeni soru-cevap çifti '{args.qa}' ve '{args.output}' dosyalarına eklendi.")
+    return 0
+
+
+def _add_generate_arguments(parser):
+    parser.add_argument("--progress", default="progress.txt", help="ilerleme dosyası (varsayılan: progress.txt)")
+    resume = parser.add_mutually_exclusive_group()
+    resume.add_argument("--restart", action="store_true", help="ilerlemeyi yok say, çıktıları baştan yaz")
+    resume.add_argument("--resume", action="store_true",
+                        help="aynı kaynağın ilerlemesinden devam et; yoksa hata ver (varsayılan: varsa devam et)")
+    parser.add_argument("--cache", action="store_true", help="sunucu prompt önbelleğini kullan: cache_prompt ve sabit slot (PRELID_CACHE_MODE=1 ile aynı)")
+    parser.add_argument("--slot", type=int, help="önbellek modunda isteklerin bağlanacağı sunucu slotu (varsayılan: PRELID_SLOT_ID veya 0)")
+    parser.add_argument("--no-cooldown", action="store_true", help="paragraflar arasındaki 10-20 saniyelik beklemeyi kapat")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="prelid", description="PDF -> paragraf -> soru-cevap -> CSV hattı")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    split = subparsers.add_parser("split", help="PDF'i paragraflara böl")
+    split.add_argument("pdf", help="PDF dosya yolu")
+    split.add_argument("--pages", help="sayfa aralığı, örn: 12-15 veya 5 (varsayılan: tümü)")
+    split.add_argument("-o", "--output", default="PreLidPreLim.json", help="çıktı dosyası (.json veya .jsonl)")
+    split.set_defaults(func=cmd_split)
+
+    generate = subparsers.add_parser("generate", help="paragraflardan soru-cevap üret")
+    generate.add_argument("-i", "--input", default="PreLidPreLim.json", help="paragraf dosyası (.json veya .jsonl)")
+    generate.add_argument("-o", "--output", default="trainset_qa.jsonl", help="soru-cevap çıktısı (.jsonl)")
+    _add_generate_arguments(generate)
+    generate.set_defaults(func=cmd_generate)
+
+    export = subparsers.add_parser("export", help="soru-cevap çiftlerini CSV'ye aktar")
+    export.add_argument("-i", "--input", default="trainset_qa.jsonl", help="soru-cevap dosyası (.jsonl veya .json)")
+    export.add_argument("-o", "--output", default="trainset_qa.csv", help="CSV çıktısı")
+    export.set_defaults(func=cmd_export)
+
+    run = subparsers.add_parser("run", help="tüm hattı akış halinde çalıştır")
+    run.add_argument("pdf", nargs="?", help="PDF dosya yolu ('split' aşamasından başlarken gerekli)")
+    run.add_argument("--pages", help="sayfa aralığı, örn: 12-15 veya 5 (varsayılan: tümü)")
+    run.add_argument("--from", dest="start", choices=["split", "generate", "export"], default="split",
+                     help="başlanacak aşama; 'generate' paragraf dosyasını, 'export' soru-cevap dosyasını kullanır")
+    run.add_argument("--paragraphs", default="paragraphs.jsonl", help="paragraf ara dosyası (varsayılan: paragraphs.jsonl)")
+    run.add_argument("--qa", default="trainset_qa.jsonl", help="soru-cevap ara dosyası (varsayılan: trainset_qa.jsonl)")
+    run.add_argument("-o", "--output", default="trainset_qa.csv", help="CSV çıktısı (varsayılan: trainset_qa.csv)")
+    _add_generate_arguments(run)
+    run.set_defaults(func=cmd_run)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except Exception as e:
+        print(f"\n❌ Hata: {str(e)}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())